@@ -76,7 +76,11 @@ COLUMNS_TO_SAVE = [
 # 크롤링 설정
 MAX_RETRIES = 3  # 최대 재시도 횟수
 REQUEST_DELAY = (3, 5)  # 요청 간 대기 시간 범위 (초)
-RETRY_DELAY = (5, 10)   # 재시도 시 대기 시간 범위 (초)
+RETRY_BACKOFF_FACTOR = 1.5  # HTTP 레벨 재시도 지수 백오프 계수
+RETRY_STATUS_FORCELIST = (429, 500, 502, 503, 504)  # 재시도할 HTTP 상태 코드
+RETRY_DELAY_BASE = 10  # 비정상 응답 재시도 시 기본 대기 시간 (초), 시도마다 2배 증가
+MAX_WORKERS = 4  # 동시에 수집할 페이지 수
+REQUEST_TIMEOUT = (3.05, 10)  # (연결, 응답) 타임아웃 (초)
 
 # 출력 파일 설정
 OUTPUT_FILE = 'naver_real_estate_with_region.csv' 
\ No newline at end of file
@@ -1,137 +1,243 @@
+import csv
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlencode
+
+import orjson
 import requests
-import pandas as pd
-from typing import Optional, List, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, List, Dict, Any, TextIO
 
 from config import (
     NAVER_LAND_URL, DEFAULT_PARAMS, COOKIES,
-    MAX_RETRIES, REQUEST_DELAY, RETRY_DELAY,
+    MAX_RETRIES, REQUEST_DELAY, REQUEST_TIMEOUT,
+    RETRY_BACKOFF_FACTOR, RETRY_STATUS_FORCELIST, RETRY_DELAY_BASE,
+    MAX_WORKERS,
     COLUMNS_TO_SAVE, OUTPUT_FILE
 )
-from utils import get_region_name, get_random_headers, random_sleep
+from utils import (
+    get_region_name, get_random_headers, get_random_user_agent,
+    random_delay, backoff_delay
+)
+
+# page를 제외한 요청 파라미터는 고정이므로 쿼리 문자열을 한 번만 인코딩
+BASE_URL = f"{NAVER_LAND_URL}?{urlencode(DEFAULT_PARAMS)}"
+
+# 응답 본문을 문자열로 디코딩하지 않고 바이트에서 바로 CAPTCHA 여부를 확인
+CAPTCHA_MARKER = "비정상적인 접근".encode()
 
 class NaverLandCrawler:
     """네이버 부동산 크롤러 클래스"""
     
     def __init__(self):
-        self.all_articles: List[Dict[str, Any]] = []
+        self.saved_count = 0
         self.current_page = 1
+        self.preview: List[Dict[str, Any]] = []
+        self._output: Optional[TextIO] = None
+        self._writer: Optional[csv.DictWriter] = None
+        self.session = self._create_session()
+        self._request_turn = threading.Lock()
+        self._stop = threading.Event()
+    
+    def _create_session(self) -> requests.Session:
+        """커넥션을 재사용하는 HTTP 세션 생성"""
+        session = requests.Session()
+        retry = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_FORCELIST,
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True
+        )
+        session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS, max_retries=retry))
+        session.cookies.update(COOKIES)
+        session.headers.update(get_random_headers())
+        return session
     
     def get_real_estate_data(self, page_no: int) -> Optional[Dict]:
         """특정 페이지의 부동산 데이터를 가져오는 함수"""
-        params = DEFAULT_PARAMS.copy()
-        params['page'] = page_no
-        
-        # 랜덤 딜레이 추가
-        random_sleep(*REQUEST_DELAY)
-        
         try:
-            response = requests.get(
-                NAVER_LAND_URL,
-                params=params,
-                cookies=COOKIES,
-                headers=get_random_headers()
+            response = self.session.get(
+                f"{BASE_URL}&page={page_no}",
+                headers={'user-agent': get_random_user_agent()},
+                timeout=REQUEST_TIMEOUT
             )
             
             if response.status_code != 200:
                 print(f"API 요청 실패: 상태 코드 {response.status_code}")
                 return None
                 
-            if "비정상적인 접근" in response.text:
+            if CAPTCHA_MARKER in response.content:
                 print("CAPTCHA 감지: 서비스 이용이 제한되었습니다.")
                 return None
                 
-            return response.json()
+            return orjson.loads(response.content)
             
-        except Exception as e:
-            print(f"요청 중 에러 발생: {e}")
+        except ValueError as e:
+            print(f"응답 파싱 중 에러 발생: {e}")
             return None
     
-    def collect_data(self) -> bool:
-        """전체 데이터 수집"""
-        while True:
-            retry_count = 0
-            success = False
-            
-            while retry_count < MAX_RETRIES and not success:
-                try:
-                    print(f"\n페이지 {self.current_page} 수집 중... (시도 {retry_count + 1}/{MAX_RETRIES})")
-                    data = self.get_real_estate_data(self.current_page)
-                    
-                    if data is None:
-                        print(f"재시도 중... ({retry_count + 1}/{MAX_RETRIES})")
-                        retry_count += 1
-                        random_sleep(*RETRY_DELAY)
-                        continue
-                        
-                    success = True
-                    
-                except Exception as e:
-                    print(f"에러 발생: {e}")
-                    retry_count += 1
-                    if retry_count < MAX_RETRIES:
-                        random_sleep(*RETRY_DELAY)
-                        continue
-                    break
-            
-            if not success:
-                print("최대 재시도 횟수 초과")
-                return False
+    def fetch_page(self, page_no: int) -> Optional[Dict]:
+        """특정 페이지를 가져오고 응답이 비정상이면 백오프 후 재시도"""
+        # 대기는 모두 _stop 이벤트로 수행하여, 수집이 끝나면 대기 중인 워커가 즉시 종료되도록 함
+        for attempt in range(MAX_RETRIES):
+            if self._stop.is_set():
+                return None
                 
-            if not data.get('body', []):
-                print("더 이상 데이터가 없습니다.")
-                break
+            # 랜덤 딜레이 추가
+            # 모든 워커가 잠금을 공유하므로 요청 시작 간격은 워커 수와 관계없이 REQUEST_DELAY 이상 유지
+            with self._request_turn:
+                if self._stop.wait(random_delay(*REQUEST_DELAY)):
+                    return None
                 
-            self.all_articles.extend(data['body'])
-            
-            if not data.get('more', False):
-                print("마지막 페이지입니다.")
-                break
+            print(f"\n페이지 {page_no} 수집 중... (시도 {attempt + 1}/{MAX_RETRIES})")
+            try:
+                data = self.get_real_estate_data(page_no)
+            except requests.RequestException as e:
+                # 연결 오류와 429/5xx는 세션 어댑터가 이미 재시도했으므로 여기서 중단
+                print(f"요청 중 에러 발생: {e}")
+                return None
                 
-            self.current_page += 1
+            if data is not None:
+                return data
+            
+            if attempt + 1 < MAX_RETRIES:
+                print(f"재시도 중... ({attempt + 1}/{MAX_RETRIES})")
+                if self._stop.wait(backoff_delay(attempt, RETRY_DELAY_BASE)):
+                    return None
         
+        return None
+    
+    def _add_page(self, page_no: int, data: Dict) -> bool:
+        """페이지 데이터를 추가하고 다음 페이지가 남아있는지 반환"""
+        self.current_page = page_no
+        
+        if not data.get('body', []):
+            print("더 이상 데이터가 없습니다.")
+            return False
+            
+        self.write_csv(data['body'])
+        
+        if not data.get('more', False):
+            print("마지막 페이지입니다.")
+            return False
+            
         return True
     
-    def process_data(self) -> Optional[pd.DataFrame]:
-        """수집된 데이터 처리"""
-        if not self.all_articles:
-            return None
+    def collect_data(self) -> bool:
+        """전체 데이터 수집"""
+        self._stop.clear()
+        
+        # 첫 페이지는 순차적으로 요청하여 다음 페이지 존재 여부 확인
+        data = self.fetch_page(1)
+        if data is None:
+            print("최대 재시도 횟수 초과")
+            return False
             
-        # 데이터프레임 생성
-        df = pd.DataFrame(self.all_articles)
+        if not self._add_page(1, data):
+            return True
         
+        # 이후 페이지는 최대 MAX_WORKERS개를 동시에 요청하고, 결과가 도착하는 대로 다음 페이지를 추가
+        executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        pending = {}
+        results = {}
+        next_submit = next_apply = 2
+        try:
+            while True:
+                while len(pending) + len(results) < MAX_WORKERS:
+                    pending[executor.submit(self.fetch_page, next_submit)] = next_submit
+                    next_submit += 1
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+                
+                # 도착 순서와 관계없이 페이지 순서대로 반영하고 마지막 페이지에서 중단
+                while next_apply in results:
+                    data = results.pop(next_apply)
+                    if data is None:
+                        print("최대 재시도 횟수 초과")
+                        return False
+                        
+                    if not self._add_page(next_apply, data):
+                        return True
+                        
+                    next_apply += 1
+        finally:
+            # 남은 페이지는 취소하고, 이미 실행 중인 작업은 다음 요청 전에 종료
+            self._stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def write_csv(self, rows: List[Dict[str, Any]]) -> None:
+        """한 페이지 분량의 매물에 지역명을 추가하여 CSV 파일에 이어서 저장"""
         # 지역 코드를 지역명으로 변환
-        print("\n지역 정보 변환 중...")
-        if 'cortarNo' in df.columns:
-            df['region'] = df['cortarNo'].apply(get_region_name)
-        else:
-            print("경고: 'cortarNo' 컬럼을 찾을 수 없습니다.")
-            df['region'] = '지역정보없음'
+        missing = 0
+        for row in rows:
+            cortar_no = row.get('cortarNo')
+            if cortar_no is None:
+                row['region'] = '지역정보없음'
+                missing += 1
+            else:
+                row['region'] = get_region_name(cortar_no)
+        if missing:
+            print(f"경고: {missing}개 매물에서 'cortarNo' 정보를 찾을 수 없습니다.")
         
-        # 필요한 컬럼만 선택
-        available_columns = [col for col in COLUMNS_TO_SAVE if col in df.columns]
-        return df[available_columns]
-    
-    def save_data(self, df: pd.DataFrame) -> None:
-        """데이터프레임을 CSV 파일로 저장"""
-        df.to_csv(OUTPUT_FILE, index=False, encoding='utf-8-sig')
-        print(f"\n데이터 저장 완료: {OUTPUT_FILE}")
-        print(f"총 {len(df)}개의 매물이 저장되었습니다.")
+        # 모든 페이지가 COLUMNS_TO_SAVE 헤더를 공유하며, 없는 값은 빈 칸으로 저장
+        if self._writer is None:
+            self._writer = csv.DictWriter(
+                self._output,
+                fieldnames=COLUMNS_TO_SAVE,
+                restval='',
+                extrasaction='ignore'
+            )
+            self._writer.writeheader()
+        
+        self._writer.writerows(rows)
+        self._output.flush()
+        
+        if not self.preview:
+            self.preview = rows[:5]
+        self.saved_count += len(rows)
     
     def run(self) -> None:
         """크롤링 실행"""
         print("네이버 부동산 데이터 수집 시작...")
         
-        if not self.collect_data():
-            print("데이터 수집 실패")
-            return
+        # 페이지를 수집할 때마다 임시 파일에 기록하고, 성공한 경우에만 기존 출력 파일을 교체
+        part_file = f"{OUTPUT_FILE}.part"
+        try:
+            with open(part_file, 'w', encoding='utf-8-sig', newline='') as f:
+                self._output = f
+                success = self.collect_data()
             
-        print(f"\n총 {self.current_page}페이지 수집 완료")
-        print(f"수집된 매물 수: {len(self.all_articles)}")
-        
-        df = self.process_data()
-        if df is not None:
-            self.save_data(df)
-            print("\n데이터 미리보기:")
-            preview_columns = ['atclNm', 'region', 'rletTpNm', 'tradTpNm']
-            available_preview = [col for col in preview_columns if col in df.columns]
-            print(df[available_preview].head().to_string()) 
\ No newline at end of file
+            if not success:
+                print("데이터 수집 실패")
+                if self.saved_count:
+                    print(f"수집된 {self.saved_count}개의 매물은 {part_file}에 저장되어 있습니다.")
+                else:
+                    os.remove(part_file)
+                return
+                
+            if not self.saved_count:
+                print("저장할 매물이 없습니다.")
+                os.remove(part_file)
+                return
+                
+            os.replace(part_file, OUTPUT_FILE)
+            
+            print(f"\n총 {self.current_page}페이지 수집 완료")
+            print(f"\n데이터 저장 완료: {OUTPUT_FILE}")
+            print(f"총 {self.saved_count}개의 매물이 저장되었습니다.")
+            
+            if self.preview:
+                print("\n데이터 미리보기:")
+                preview_columns = ['atclNm', 'region', 'rletTpNm', 'tradTpNm']
+                print(' | '.join(preview_columns))
+                for row in self.preview:
+                    print(' | '.join(str(row.get(col, '')) for col in preview_columns))
+        finally:
+            self._output = None
+            self._writer = None
+            self.session.close()
\ No newline at end of file
@@ -1,19 +1,32 @@
-import time
 import random
-from fake_useragent import UserAgent
+from functools import lru_cache
 from config import REGION_CODES
 
+FALLBACK_USER_AGENT = (
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) '
+    'AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1'
+)
+
+@lru_cache(maxsize=1)
+def _get_ua():
+    """UserAgent 인스턴스를 처음 필요할 때 한 번만 생성"""
+    # fake_useragent는 import와 생성 시 내부 데이터베이스를 읽어오므로 사용 시점까지 지연
+    try:
+        from fake_useragent import UserAgent
+        return UserAgent()
+    except Exception:
+        return None
+
 def get_region_name(cortarNo):
     """지역 코드를 지역명으로 변환"""
     return REGION_CODES.get(cortarNo, f'기타지역({cortarNo})')
 
 def get_random_headers():
     """랜덤 헤더 생성"""
-    ua = UserAgent()
     return {
         'accept': 'application/json, text/javascript, */*; q=0.01',
         'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-        'user-agent': ua.random,
+        'user-agent': get_random_user_agent(),
         'referer': 'https://m.land.naver.com/',
         'sec-ch-ua-mobile': '?1',
         'sec-fetch-dest': 'empty',
@@ -22,6 +35,18 @@ def get_random_headers():
         'x-requested-with': 'XMLHttpRequest',
     }
 
-def random_sleep(min_sec, max_sec):
-    """랜덤한 시간 동안 대기"""
-    time.sleep(random.uniform(min_sec, max_sec)) 
\ No newline at end of file
+def get_random_user_agent():
+    """랜덤 User-Agent 문자열 반환"""
+    ua = _get_ua()
+    if ua is None:
+        return FALLBACK_USER_AGENT
+    return ua.random
+
+def random_delay(min_sec, max_sec):
+    """랜덤한 대기 시간 반환 (초)"""
+    return random.uniform(min_sec, max_sec)
+
+def backoff_delay(attempt, base_sec):
+    """지수 백오프에 jitter를 적용한 대기 시간 반환 (base_sec * 2**attempt의 절반 이상, 초)"""
+    delay = base_sec * 2 ** attempt
+    return random.uniform(delay / 2, delay)
\ No newline at end of file